@@ -7,6 +7,13 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     DATABASE_URL: str
 
+    #Optional JWT keyring (JSON), kid -> {"alg", "key", "public_key", "verify_until"}
+    #SECRET_KEY/ALGORITHM are always registered under the reserved "default" kid
+    JWT_KEYS: dict[str, dict] = {}
+    JWT_ACTIVE_KID: str = "default"
+    #ISO 8601 end of the overlap window for the "default" key once rotated away from
+    JWT_DEFAULT_VERIFY_UNTIL: str | None = None
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+from jose import jwt, jwk, JWTError
+from jose.constants import ALGORITHMS
+from app.core.config import settings
+
+#Algorithms the keyring will sign/verify with. EdDSA is not supported by python-jose.
+#Signing runs inline on the event loop, so only algorithms that sign in tens of microseconds
+#are allowed (see benchmarks/jwt_sign_verify.py). RS256 signs in ~0.4 ms and is left out.
+SUPPORTED_ALGORITHMS = (ALGORITHMS.HS256, ALGORITHMS.HS384, ALGORITHMS.HS512, ALGORITHMS.ES256)
+DEFAULT_KID = "default"
+#Fixed message signed at build time to check key pairs
+PROBE = b"jwt-keyring-probe"
+
+class SigningKey:
+    #A single keyring entry. Key material is parsed once into jose Key objects,
+    #so signing and verifying never re-parse secrets or PEM data per request.
+
+    def __init__(self, kid: str, alg: str, key: str, public_key: str | None = None, verify_until: datetime | None = None):
+        if alg not in SUPPORTED_ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm '{alg}' for key '{kid}'.")
+        self.kid = kid
+        self.alg = alg
+        self.verify_until = verify_until
+
+        #Private/secret key for signing, public key (or shared secret) for verifying
+        self.signer = jwk.construct(key, alg)
+        if alg in ALGORITHMS.HMAC:
+            self.verifier = self.signer
+        elif public_key:
+            self.verifier = jwk.construct(public_key, alg)
+        else:
+            self.verifier = self.signer.public_key()
+
+        #Catch a public_key that does not belong to the private key before any token is issued
+        if self.can_sign and not self.verifier.verify(PROBE, self.signer.sign(PROBE)):
+            raise ValueError(f"Public key for JWT key '{kid}' does not match its private key.")
+
+    @property
+    def can_sign(self) -> bool:
+        #Shared secrets and private keys can sign, public-only keys can only verify
+        return self.alg in ALGORITHMS.HMAC or not self.signer.is_public()
+
+    def can_verify(self, now: datetime) -> bool:
+        #Retired keys keep verifying until the end of their overlap window
+        return self.verify_until is None or now < self.verify_until
+
+class TokenKeyring:
+    #kid-indexed set of signing keys. One key is active for signing, the rest only verify.
+
+    def __init__(self, keys: list[SigningKey], active_kid: str):
+        self.keys = {}
+        for key in keys:
+            if key.kid in self.keys:
+                raise ValueError(f"Duplicate JWT key id '{key.kid}'.")
+            self.keys[key.kid] = key
+        if active_kid not in self.keys:
+            raise ValueError(f"Active JWT key '{active_kid}' is not in the keyring.")
+        self.active = self.keys[active_kid]
+        if not self.active.can_sign:
+            raise ValueError(f"Active JWT key '{active_kid}' is a public key and cannot sign.")
+        #The signing key must not expire, or every newly issued token would stop verifying
+        if self.active.verify_until is not None:
+            raise ValueError(f"Active JWT key '{active_kid}' cannot have a verify_until.")
+
+    def sign(self, claims: dict) -> str:
+        #Sign claims with the active key, tagging the header with its kid
+        return jwt.encode(claims, self.active.signer, algorithm=self.active.alg, headers={"kid": self.active.kid})
+
+    def verify(self, token: str) -> dict | None:
+        #Decode and validate a token against the key named by its kid, None if invalid
+        try:
+            #Tokens issued before kids were added fall back to the default key
+            kid = jwt.get_unverified_header(token).get("kid", DEFAULT_KID)
+            if not isinstance(kid, str):
+                return None
+            key = self.keys.get(kid)
+            if key is None or not key.can_verify(datetime.now(timezone.utc)):
+                return None
+            return jwt.decode(token, key.verifier, algorithms=[key.alg])
+        except JWTError:
+            return None
+
+def _parse_verify_until(value) -> datetime | None:
+    #Accept ISO 8601 strings from env/JSON, assume UTC when no offset is given
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+def build_keyring(config=settings) -> TokenKeyring:
+    #Build the keyring from settings: SECRET_KEY/ALGORITHM as "default" plus any JWT_KEYS entries
+    if DEFAULT_KID in config.JWT_KEYS:
+        raise ValueError(f"JWT_KEYS cannot define '{DEFAULT_KID}', it is built from SECRET_KEY/ALGORITHM.")
+    keys = [SigningKey(
+        DEFAULT_KID,
+        config.ALGORITHM,
+        config.SECRET_KEY,
+        verify_until=_parse_verify_until(config.JWT_DEFAULT_VERIFY_UNTIL),
+    )]
+    for kid, entry in config.JWT_KEYS.items():
+        if "alg" not in entry or "key" not in entry:
+            raise ValueError(f"JWT key '{kid}' must define 'alg' and 'key'.")
+        keys.append(SigningKey(
+            kid,
+            entry["alg"],
+            entry["key"],
+            public_key=entry.get("public_key"),
+            verify_until=_parse_verify_until(entry.get("verify_until")),
+        ))
+    return TokenKeyring(keys, config.JWT_ACTIVE_KID)
+
+#Built once at import so request handlers only do the signature math
+keyring = build_keyring()
@@ -8,8 +8,8 @@ from app.db import get_db
 from app.models import User
 from passlib.context import CryptContext 
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
 from app.core.config import settings
+from app.core.tokens import keyring
 
 #Initialize API Router, hashing context, and oauth2 scheme
 router = APIRouter(prefix='/auth', tags=['auth'])
@@ -49,20 +49,17 @@ def create_jwt_token(user_id: int):
     #Short lived access token, contains user id
     now = datetime.now(timezone.utc)
     encode = {"sub": str(user_id), "iat": now, "exp": now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES), "type": "access"}
-    return jwt.encode(encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return keyring.sign(encode)
 
 def create_refresh_token(user_id: int):
     #Long lived refresh token, contains user id
     now = datetime.now(timezone.utc)
     encode = {"sub": str(user_id), "iat": now, "exp": now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS), "type": "refresh"}
-    return jwt.encode(encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return keyring.sign(encode)
 
 def decode_jwt_token(token: str):
-    #Decode and validate JWT token
-    try:
-        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-    except JWTError:
-        return None
+    #Decode and validate JWT token against the key named by its kid
+    return keyring.verify(token)
 
 #Auth routes
 
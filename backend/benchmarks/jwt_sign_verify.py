@@ -0,0 +1,65 @@
+import os
+import timeit
+from datetime import datetime, timedelta, timezone
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwt
+
+#Settings are loaded on import of app.core, provide placeholders when run standalone
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+from app.core.tokens import SigningKey, TokenKeyring
+
+#Microbenchmark of JWT sign/verify ops per second per algorithm
+#Run from backend/: python -m benchmarks.jwt_sign_verify
+
+NUMBER = 2000
+
+def _pems(private_key):
+    #Private and public PEM, the public one is what a verifier would hold
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+def _keys():
+    #alg -> (signing key, verifying key), every algorithm in SUPPORTED_ALGORITHMS
+    secret = "x" * 64
+    return {
+        "HS256": (secret, secret),
+        "HS384": (secret, secret),
+        "HS512": (secret, secret),
+        "ES256": _pems(ec.generate_private_key(ec.SECP256R1())),
+    }
+
+def _ops_per_sec(fn, number=NUMBER):
+    return number / min(timeit.repeat(fn, number=number, repeat=3))
+
+def main():
+    now = datetime.now(timezone.utc)
+    claims = {"sub": "1", "iat": now, "exp": now + timedelta(minutes=20), "type": "access"}
+
+    print(f"{'alg':<8}{'sign/s':>12}{'verify/s':>12}{'sign/s (uncached)':>20}{'verify/s (uncached)':>22}")
+    for alg, (key, public_key) in _keys().items():
+        keyring = TokenKeyring([SigningKey(alg, alg, key)], alg)
+        token = keyring.sign(claims)
+
+        #Cached: key objects parsed once by the keyring
+        sign = _ops_per_sec(lambda: keyring.sign(claims))
+        verify = _ops_per_sec(lambda: keyring.verify(token))
+
+        #Uncached: key material re-parsed on every call (previous behaviour)
+        uncached_sign = _ops_per_sec(lambda: jwt.encode(claims, key, algorithm=alg), number=NUMBER // 10)
+        uncached_verify = _ops_per_sec(lambda: jwt.decode(token, public_key, algorithms=[alg]), number=NUMBER // 10)
+
+        print(f"{alg:<8}{sign:>12,.0f}{verify:>12,.0f}{uncached_sign:>20,.0f}{uncached_verify:>22,.0f}")
+
+if __name__ == "__main__":
+    main()
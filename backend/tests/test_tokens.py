@@ -0,0 +1,181 @@
+import pytest
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from app.core.tokens import SigningKey, TokenKeyring, DEFAULT_KID, build_keyring, _parse_verify_until
+import app.routes.auth as auth
+from jose import jwt
+
+#Helpers
+def _es256_pem():
+    return _es256_pems()[0]
+
+def _es256_pems():
+    #Private and public PEM for a fresh P-256 key
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+def _config(**overrides):
+    config = {
+        "SECRET_KEY": "legacy-secret",
+        "ALGORITHM": "HS256",
+        "JWT_KEYS": {},
+        "JWT_ACTIVE_KID": DEFAULT_KID,
+        "JWT_DEFAULT_VERIFY_UNTIL": None,
+    }
+    config.update(overrides)
+    return SimpleNamespace(**config)
+
+def _claims():
+    now = datetime.now(timezone.utc)
+    return {"sub": "1", "iat": now, "exp": now + timedelta(minutes=5), "type": "access"}
+
+#Tests
+def test_sign_and_verify_with_kid():
+    keyring = TokenKeyring([SigningKey("k1", "HS256", "secret-one")], "k1")
+    token = keyring.sign(_claims())
+    assert jwt.get_unverified_header(token)["kid"] == "k1"
+    assert keyring.verify(token)["sub"] == "1"
+
+def test_es256_key():
+    keyring = TokenKeyring([SigningKey("ec1", "ES256", _es256_pem())], "ec1")
+    token = keyring.sign(_claims())
+    assert keyring.verify(token)["type"] == "access"
+
+def test_rotation_overlap_window():
+    #Tokens signed with the old key still verify after rotation, until verify_until passes
+    old = SigningKey("old", "HS256", "old-secret")
+    old_token = TokenKeyring([old], "old").sign(_claims())
+
+    in_window = SigningKey("old", "HS256", "old-secret", verify_until=datetime.now(timezone.utc) + timedelta(days=1))
+    rotated = TokenKeyring([in_window, SigningKey("new", "ES256", _es256_pem())], "new")
+    assert rotated.verify(old_token)["sub"] == "1"
+    assert jwt.get_unverified_header(rotated.sign(_claims()))["kid"] == "new"
+
+    expired = SigningKey("old", "HS256", "old-secret", verify_until=datetime.now(timezone.utc) - timedelta(seconds=1))
+    retired = TokenKeyring([expired, SigningKey("new", "HS256", "new-secret")], "new")
+    assert retired.verify(old_token) is None
+
+def test_legacy_token_without_kid():
+    #Tokens issued before kids were added verify against the default key
+    keyring = TokenKeyring([SigningKey(DEFAULT_KID, "HS256", "legacy-secret")], DEFAULT_KID)
+    token = jwt.encode(_claims(), "legacy-secret", algorithm="HS256")
+    assert keyring.verify(token)["sub"] == "1"
+
+def test_invalid_tokens():
+    keyring = TokenKeyring([SigningKey("k1", "HS256", "secret-one")], "k1")
+    other = TokenKeyring([SigningKey("k2", "HS256", "secret-two")], "k2")
+    assert keyring.verify(other.sign(_claims())) is None
+    assert keyring.verify("invalid.token.here") is None
+
+def test_non_string_kid():
+    #kid comes from the untrusted header, non-string values must be rejected not raise
+    keyring = TokenKeyring([SigningKey("k1", "HS256", "secret-one")], "k1")
+    for kid in (["k1"], {"k1": 1}, 1):
+        token = jwt.encode(_claims(), "secret-one", algorithm="HS256", headers={"kid": kid})
+        assert keyring.verify(token) is None
+
+def test_active_kid_must_exist():
+    with pytest.raises(ValueError):
+        TokenKeyring([SigningKey("k1", "HS256", "secret-one")], "missing")
+
+def test_active_key_cannot_expire():
+    for verify_until in (datetime(2020, 1, 1, tzinfo=timezone.utc), datetime.now(timezone.utc) + timedelta(days=1)):
+        with pytest.raises(ValueError):
+            TokenKeyring([SigningKey("k1", "HS256", "secret-one", verify_until=verify_until)], "k1")
+
+def test_duplicate_kids_rejected():
+    with pytest.raises(ValueError):
+        TokenKeyring([SigningKey("k1", "HS256", "secret-one"), SigningKey("k1", "HS256", "secret-two")], "k1")
+
+def test_rotation_away_from_default_key():
+    #Legacy tokens without a kid only verify until JWT_DEFAULT_VERIFY_UNTIL
+    legacy_token = jwt.encode(_claims(), "legacy-secret", algorithm="HS256")
+    new_keys = {"k2": {"alg": "HS256", "key": "secret-two"}}
+
+    in_window = (datetime.now(timezone.utc) + timedelta(days=7)).isoformat()
+    keyring = build_keyring(_config(JWT_KEYS=new_keys, JWT_ACTIVE_KID="k2", JWT_DEFAULT_VERIFY_UNTIL=in_window))
+    assert keyring.verify(legacy_token)["sub"] == "1"
+
+    keyring = build_keyring(_config(JWT_KEYS=new_keys, JWT_ACTIVE_KID="k2", JWT_DEFAULT_VERIFY_UNTIL="2020-01-01T00:00:00"))
+    assert keyring.verify(legacy_token) is None
+
+def test_jwt_keys_cannot_override_default():
+    with pytest.raises(ValueError):
+        build_keyring(_config(JWT_KEYS={DEFAULT_KID: {"alg": "HS256", "key": "other-secret"}}))
+
+def test_parse_verify_until():
+    assert _parse_verify_until(None) is None
+    assert _parse_verify_until("2030-01-01T00:00:00") == datetime(2030, 1, 1, tzinfo=timezone.utc)
+    assert _parse_verify_until("2030-01-01T02:00:00+02:00") == datetime(2030, 1, 1, tzinfo=timezone.utc)
+    assert _parse_verify_until(datetime(2030, 1, 1)) == datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+def test_build_keyring_from_config():
+    private_pem, public_pem = _es256_pems()
+    config = _config(
+        JWT_KEYS={
+            "ec1": {"alg": "ES256", "key": private_pem, "public_key": public_pem},
+            "old": {"alg": "HS512", "key": "old-secret", "verify_until": "2030-01-01T00:00:00+00:00"},
+        },
+        JWT_ACTIVE_KID="ec1",
+    )
+    keyring = build_keyring(config)
+    assert set(keyring.keys) == {DEFAULT_KID, "ec1", "old"}
+    assert keyring.active.kid == "ec1"
+    assert keyring.keys["old"].verify_until == datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    token = keyring.sign(_claims())
+    assert jwt.get_unverified_header(token) == {"alg": "ES256", "typ": "JWT", "kid": "ec1"}
+    assert keyring.verify(token)["sub"] == "1"
+
+    #Verification uses the configured public key
+    assert jwt.decode(token, public_pem, algorithms=["ES256"])["sub"] == "1"
+
+def test_build_keyring_unsupported_alg():
+    with pytest.raises(ValueError):
+        build_keyring(_config(JWT_KEYS={"k1": {"alg": "none", "key": "secret"}}))
+    with pytest.raises(ValueError):
+        build_keyring(_config(ALGORITHM="EdDSA"))
+    with pytest.raises(ValueError):
+        build_keyring(_config(JWT_KEYS={"rsa": {"alg": "RS256", "key": "secret"}}))
+
+def test_auth_helpers_round_trip():
+    #Route helpers sign and verify through the module-level keyring
+    access = auth.decode_jwt_token(auth.create_jwt_token(42))
+    refresh = auth.decode_jwt_token(auth.create_refresh_token(42))
+    assert access["sub"] == "42" and access["type"] == "access"
+    assert refresh["sub"] == "42" and refresh["type"] == "refresh"
+    assert jwt.get_unverified_header(auth.create_jwt_token(42))["kid"] == auth.settings.JWT_ACTIVE_KID
+
+def test_mismatched_key_pair_rejected():
+    private_pem, _ = _es256_pems()
+    _, other_public_pem = _es256_pems()
+    with pytest.raises(ValueError):
+        SigningKey("ec1", "ES256", private_pem, public_key=other_public_pem)
+
+def test_public_only_keys():
+    #A public key in "key" can verify as a retired key, but cannot be the active one
+    private_pem, public_pem = _es256_pems()
+    token = TokenKeyring([SigningKey("ec1", "ES256", private_pem)], "ec1").sign(_claims())
+
+    retired = SigningKey("ec1", "ES256", public_pem, verify_until=datetime.now(timezone.utc) + timedelta(days=1))
+    keyring = TokenKeyring([retired, SigningKey("k2", "HS256", "secret-two")], "k2")
+    assert keyring.verify(token)["sub"] == "1"
+
+    with pytest.raises(ValueError):
+        TokenKeyring([SigningKey("ec1", "ES256", public_pem)], "ec1")
+
+def test_build_keyring_missing_fields():
+    for entry in ({"key": "secret"}, {"alg": "HS256"}):
+        with pytest.raises(ValueError, match="'k1'"):
+            build_keyring(_config(JWT_KEYS={"k1": entry}))
\ No newline at end of file